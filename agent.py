@@ -1,10 +1,7 @@
 import os
 from typing import Any, Dict, Union
 from dotenv import load_dotenv
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain_core.prompts import PromptTemplate
-from langchain_community.llms import Ollama
-from tools.profit_quality import profit_quality_analysis
+from tools.profit_quality import _analyze_ticker, _profit_quality_core
 from data_fetcher import DataFetcher
 from financial_analyzer import FinancialAnalyzer
 from schemas import FinancialData
@@ -25,48 +22,55 @@ class ProfitQualityAgent:
     """
     
     def __init__(self):
-        """Initialize the agent with LLM and tools"""
+        """Initialize the agent; the LLM is only built if explain() is used"""
+        # The analysis itself is deterministic — the LLM client (and the old
+        # ReAct prompt wiring) added seconds of startup for a path that
+        # analyze_company never exercised, so construction is now lazy.
+        self.llm = None
+
+    def _build_llm(self):
+        """Construct the LLM client on first use (local Ollama or OpenAI)"""
         # Check if using local LLM or OpenAI
         use_local = os.getenv("USE_LOCAL_LLM", "true").lower() == "true"
-        
+
         if use_local:
             # Use Ollama for local LLM (free, no API key needed)
+            from langchain_community.llms import Ollama
             model_name = os.getenv("LOCAL_LLM_MODEL", "llama2")
-            self.llm = Ollama(model=model_name, temperature=0)
+            llm = Ollama(model=model_name, temperature=0)
             print(f"Using local LLM: {model_name}")
         else:
             # Fallback to OpenAI if key provided
             from langchain_openai import ChatOpenAI
-            self.llm = ChatOpenAI(
+            llm = ChatOpenAI(
                 model="gpt-4",
                 temperature=0,
                 api_key=os.getenv("OPENAI_API_KEY")
             )
             print("Using OpenAI")
-        
-        # Create ReAct prompt template
-        template = """Answer the following questions as best you can. You have access to the following tools:
+        return llm
 
-{tools}
+    def explain(self, result: str) -> str:
+        """
+        Use the LLM to summarize an analysis result (optional, slow path)
 
-Use the following format:
+        Args:
+            result: Formatted analysis string from analyze_company
 
-Question: the input question you must answer
-Thought: you should always think about what to do
-Action: the action to take, should be one of [{tool_names}]
-Action Input: the input to the action
-Observation: the result of the action
-... (this Thought/Action/Action Input/Observation can repeat N times)
-Thought: I now know the final answer
-Final Answer: the final answer to the original input question
+        Returns:
+            LLM-written summary of the analysis
+        """
+        if self.llm is None:
+            self.llm = self._build_llm()
 
-Begin!
+        prompt = f"""Analyze this financial report and provide a brief summary of the company's profit quality:
 
-Question: {input}
-Thought:{agent_scratchpad}"""
+{result}
+
+Provide a 2-3 sentence summary focusing on the key strengths or concerns."""
+
+        return self.llm.invoke(prompt)
 
-        prompt = PromptTemplate.from_template(template)
-    
     def analyze_company(self, ticker: str) -> str:
         """
         Analyze a company's profit quality and accruals using the ticker symbol
@@ -78,10 +82,11 @@ Thought:{agent_scratchpad}"""
             Analysis result as a formatted string
         """
         try:
-            # Fetch and analyze
-            result = profit_quality_analysis(ticker=ticker, risk_free_rate=0.07)
+            # Memoized ticker entry: repeat calls hit the lru/disk caches
+            # instead of re-fetching, without the tool-wrapper overhead
+            result = _analyze_ticker(ticker, 0.07)
             return result
-        
+
         except Exception as e:
             return f"Error during analysis: {str(e)}"
     
@@ -96,34 +101,50 @@ Thought:{agent_scratchpad}"""
             Analysis result as a formatted string
         """
         try:
-            return profit_quality_analysis(financial_data=financial_data)
-        
+            # FinancialData carries the rate as a percentage; core wants decimal
+            return _profit_quality_core(
+                "CUSTOM",
+                financial_data.risk_free_rate / 100,
+                financial_data=financial_data
+            )
+
         except Exception as e:
             return f"Error during analysis: {str(e)}"
 
 def create_profit_quality_agent() -> ProfitQualityAgent:
     """
     Factory function to create and return a Profit Quality Agent
-    
+
     Returns:
         Initialized ProfitQualityAgent instance
     """
     return ProfitQualityAgent()
 
+# Module-level singleton: agent construction builds an LLM client, which is
+# far too expensive to repeat on every analyze_profit_quality call
+_agent = None
+
+def _get_agent() -> ProfitQualityAgent:
+    """Return the shared agent, creating it on first use"""
+    global _agent
+    if _agent is None:
+        _agent = create_profit_quality_agent()
+    return _agent
+
 def analyze_profit_quality(ticker: str = None, financial_data: FinancialData = None) -> str:
     """
     Main exported function for profit quality analysis
     Returns analysis result as a formatted string
-    
+
     Args:
         ticker: Optional stock ticker symbol
         financial_data: Optional FinancialData object with custom metrics
-        
+
     Returns:
         Analysis result as a formatted string with metrics and scores
     """
-    agent = create_profit_quality_agent()
-    
+    agent = _get_agent()
+
     if ticker:
         return agent.analyze_company(ticker)
     elif financial_data:
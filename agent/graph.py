@@ -37,10 +37,9 @@ def analyze_node(state: ProfitQualityState) -> ProfitQualityState:
         risk_free_rate=risk_free_rate
     )
     
-    return {
-        **state,
-        "result": result
-    }
+    # Partial update: LangGraph merges this into the state, so there is no
+    # need to copy the whole dict on every node
+    return {"result": result}
 
 
 # Create the graph
@@ -63,6 +62,7 @@ profit_quality_graph = workflow.compile()
 class AdvancedProfitQualityState(TypedDict):
     company_id: str
     risk_free_rate: float
+    want_llm: bool
     analysis_result: str
     llm_interpretation: str
     result: str
@@ -79,41 +79,59 @@ def fetch_and_analyze_node(state: AdvancedProfitQualityState) -> AdvancedProfitQ
         risk_free_rate=risk_free_rate
     )
     
-    return {
-        **state,
-        "analysis_result": analysis_result
-    }
+    return {"analysis_result": analysis_result}
+
+
+# Shared LLM client and prompt template: constructing the Ollama client opens
+# a session to the local daemon, so it is built once and reused by every call
+_LLM = None
+
+_INTERPRET_PROMPT = """Analyze this financial report and provide a brief summary of the company's profit quality:
+
+{result}
+
+Provide a 2-3 sentence summary focusing on the key strengths or concerns."""
+
+
+def _get_llm():
+    """Return the shared Ollama client, or None when local LLM is disabled"""
+    global _LLM
+    if _LLM is None and os.getenv("USE_LOCAL_LLM", "true").lower() == "true":
+        _LLM = Ollama(model=os.getenv("LOCAL_LLM_MODEL", "llama2"), temperature=0)
+    return _LLM
 
 
 def interpret_node(state: AdvancedProfitQualityState) -> AdvancedProfitQualityState:
     """Optional: Use LLM to interpret results"""
     analysis_result = state.get("analysis_result", "")
-    
-    # Use local LLM if available
-    use_local = os.getenv("USE_LOCAL_LLM", "true").lower() == "true"
-    
-    if use_local:
-        try:
-            llm = Ollama(model=os.getenv("LOCAL_LLM_MODEL", "llama2"), temperature=0)
-            prompt = f"""Analyze this financial report and provide a brief summary of the company's profit quality:
 
-{analysis_result}
+    # Skip the LLM round-trip entirely unless the caller asked for it
+    if not state.get("want_llm"):
+        return {"result": analysis_result}
 
-Provide a 2-3 sentence summary focusing on the key strengths or concerns."""
-            
-            interpretation = llm.invoke(prompt)
-            
+    llm = _get_llm()
+    if llm is not None:
+        try:
+            prompt = _INTERPRET_PROMPT.format(result=analysis_result)
+            try:
+                # Stream the generation: tokens surface through LangChain's
+                # callback/streaming channels as they arrive instead of the
+                # node blocking until the final token
+                chunks = []
+                for token in llm.stream(prompt):
+                    chunks.append(token)
+                interpretation = "".join(chunks)
+            except (AttributeError, NotImplementedError):
+                # Older Ollama deployments without streaming support
+                interpretation = llm.invoke(prompt)
             final_result = f"{analysis_result}\n\nLLM INTERPRETATION:\n{interpretation}"
         except Exception as e:
             # If LLM fails, just return the analysis
             final_result = analysis_result
     else:
         final_result = analysis_result
-    
-    return {
-        **state,
-        "result": final_result
-    }
+
+    return {"result": final_result}
 
 
 # Create advanced graph
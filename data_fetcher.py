@@ -1,63 +1,139 @@
+import logging
 import os
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Any
 from dotenv import load_dotenv
 
+try:
+    import orjson  # C/SIMD JSON parser, ~2-5x faster than stdlib json
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
+_log = logging.getLogger(__name__)
+
 class DataFetcher:
     """Handles API calls to fetch financial data"""
-    
+
+    RISK_FREE_RATE_TTL = 3600  # seconds; the rate rarely changes within a run
+
     def __init__(self):
         self.api_key = os.getenv("API_KEY")
         self.api_base_url = os.getenv("API_BASE_URL")
-        
+
         if not self.api_key or not self.api_base_url:
             raise ValueError("API_KEY and API_BASE_URL must be set in .env file")
-    
+
+        # Persistent session: keep-alive connection pool + retries, so
+        # repeated fetches reuse sockets instead of paying a TCP/TLS
+        # handshake per call. Auth header is set once here.
+        self._session = requests.Session()
+        self._session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._risk_free_rate = None
+        self._risk_free_rate_fetched_at = 0.0
+
     def fetch_financial_data(self, ticker: str, years: int = 10) -> Dict[str, Any]:
         """
         Fetch financial data from API
-        
+
         Args:
             ticker: Stock ticker symbol
             years: Number of historical years to fetch
-            
+
         Returns:
             Dictionary containing financial metrics
         """
         try:
-            headers = {"Authorization": f"Bearer {self.api_key}"}
             params = {
                 "ticker": ticker,
                 "years": years,
                 "metrics": ["PAT", "CFO", "EBITDA", "Depreciation", "Sales", "Cash"]
             }
-            
-            response = requests.get(
+
+            response = self._session.get(
                 f"{self.api_base_url}/financial-data",
-                headers=headers,
                 params=params,
                 timeout=30
             )
             response.raise_for_status()
-            return response.json()
-        
+
+            # Decode the raw bytes with orjson when available and project
+            # down to the metrics the analyzer actually reads
+            if orjson is not None:
+                data = orjson.loads(response.content)
+            else:
+                data = response.json()
+            metrics = ("PAT", "CFO", "EBITDA", "Depreciation", "Sales", "Cash")
+            return {k: data[k] for k in metrics if k in data}
+
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error fetching data from API: {str(e)}")
-    
+
+    def fetch_financial_data_many(self, tickers: List[str], years: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch financial data for many tickers concurrently
+
+        The calls are network-bound, so a thread pool overlaps the
+        round-trips; all workers share the pooled session from __init__.
+        Retries with backoff (incl. 429s) are handled by the session adapter.
+
+        Args:
+            tickers: List of stock ticker symbols
+            years: Number of historical years to fetch per ticker
+
+        Returns:
+            Dict mapping ticker to its financial data dictionary; tickers
+            whose fetch failed are logged and left out of the result
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        if not tickers:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(16, len(tickers))) as executor:
+            futures = {
+                executor.submit(self.fetch_financial_data, ticker, years): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    results[ticker] = future.result()
+                except Exception as e:
+                    # One bad ticker shouldn't abort the rest of the universe
+                    _log.warning("Fetch failed for %s, skipping: %s", ticker, e)
+        return results
+
     def fetch_risk_free_rate(self) -> float:
-        """Fetch current risk-free rate"""
+        """Fetch current risk-free rate (memoized for RISK_FREE_RATE_TTL)"""
+        now = time.time()
+        if (self._risk_free_rate is not None
+                and now - self._risk_free_rate_fetched_at < self.RISK_FREE_RATE_TTL):
+            return self._risk_free_rate
+
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.api_base_url}/risk-free-rate",
-                headers={"Authorization": f"Bearer {self.api_key}"},
                 timeout=30
             )
             response.raise_for_status()
             data = response.json()
-            return data.get("rate", 4.5)  # Default fallback
-        
+            self._risk_free_rate = data.get("rate", 4.5)  # Default fallback
+            self._risk_free_rate_fetched_at = now
+            return self._risk_free_rate
+
         except requests.exceptions.RequestException as e:
             print(f"Warning: Could not fetch risk-free rate: {str(e)}")
             return 4.5  # Default risk-free rate
@@ -1,46 +1,203 @@
 from typing import List, Dict, Tuple
-import statistics
+from collections import namedtuple
+import math
+import numpy as np
+from numba import njit
+
+
+# Shared reductions over the PAT/CFO/EBITDA series, computed once per ticker
+# and passed into the methods below so the same sums/means are not re-derived
+# three times per analysis
+_Aggregates = namedtuple(
+    "_Aggregates",
+    ["sum_pat", "sum_cfo", "avg_pat", "avg_cfo", "avg_ebitda", "years"]
+)
+
+
+# Score bin edges at module scope: scores come from a branchless
+# searchsorted lookup instead of an if/elif chain, so the same tables
+# vectorize over a whole batch (scores = _ACCRUAL_SCORES[np.searchsorted(...)])
+_ACCRUAL_EDGES = np.array([0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40, 0.45])
+_ACCRUAL_SCORES = np.array([10, 9, 8, 7, 6, 5, 4, 3, 2, 1], dtype=np.int64)
+
+# Spread of earning rate over risk-free rate (percentage points): 5 at parity,
+# one point gained/lost per percentage point of spread
+_CASH_EDGES = np.array([-4.0, -3.0, -2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0])
+_CASH_SCORES = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], dtype=np.int64)
+
+
+@njit(cache=True, fastmath=True)
+def _accrual_score_kernel(pat: np.ndarray, cfo: np.ndarray) -> int:
+    """Score accrual quality 1-10 (10 = best) from PAT/CFO float64 arrays"""
+    avg_pat = pat.mean()
+    if avg_pat == 0.0:
+        return 1
+    accrual_ratio = np.abs(pat - cfo).mean() / avg_pat
+    idx = np.searchsorted(_ACCRUAL_EDGES, accrual_ratio)
+    return int(_ACCRUAL_SCORES[idx])
+
+
+@njit(cache=True, fastmath=True)
+def _cash_score_kernel(cash_balance: float, risk_free_rate: float, annual_earnings: float) -> int:
+    """Score cash earnings 1-10 (10 = earning well above risk-free rate)"""
+    if cash_balance == 0.0:
+        return 1
+    spread = annual_earnings / cash_balance * 100.0 - risk_free_rate
+    idx = np.searchsorted(_CASH_EDGES, spread)
+    return int(_CASH_SCORES[idx])
+
+
+@njit(cache=True, fastmath=True)
+def _accrual_stats_kernel(pat: np.ndarray, cfo: np.ndarray) -> Tuple[float, float, float, float]:
+    """Return (avg_pat, avg_cfo, avg_accruals, accrual_ratio) in one pass"""
+    n = pat.shape[0]
+    sum_pat = 0.0
+    sum_cfo = 0.0
+    sum_acc = 0.0
+    sum_abs_acc = 0.0
+    for i in range(n):
+        sum_pat += pat[i]
+        sum_cfo += cfo[i]
+        acc = pat[i] - cfo[i]
+        sum_acc += acc
+        sum_abs_acc += abs(acc)
+    avg_pat = sum_pat / n
+    ratio = (sum_abs_acc / n) / avg_pat if avg_pat != 0.0 else 0.0
+    return avg_pat, sum_cfo / n, sum_acc / n, ratio
+
+
+@njit(cache=True, fastmath=True)
+def _dep_volatility_kernel(dep: np.ndarray, sales: np.ndarray) -> float:
+    """Coefficient of variation of depreciation as % of sales"""
+    n = dep.shape[0]
+    s = 0.0
+    ss = 0.0
+    for i in range(n):
+        ratio = dep[i] / sales[i] * 100.0 if sales[i] != 0.0 else 0.0
+        s += ratio
+        ss += ratio * ratio
+    avg_ratio = s / n
+    variance = (ss - s * s / n) / (n - 1)
+    if variance < 0.0:
+        variance = 0.0
+    return np.sqrt(variance) / avg_ratio * 100.0 if avg_ratio != 0.0 else 0.0
+
+
+@njit(cache=True, fastmath=True)
+def _fcf_stats_kernel(cfo: np.ndarray, capex: np.ndarray) -> Tuple[float, float, int, float, float]:
+    """Return (avg_fcf, volatility_cv, negative_years, avg_cfo, avg_capex)"""
+    n = min(cfo.shape[0], capex.shape[0])
+    s = 0.0
+    ss = 0.0
+    negative_years = 0
+    for i in range(n):
+        fcf = cfo[i] - capex[i]
+        s += fcf
+        ss += fcf * fcf
+        if fcf < 0.0:
+            negative_years += 1
+    avg_fcf = s / n
+    cv = 0.0
+    if n > 1:
+        variance = (ss - s * s / n) / (n - 1)
+        if variance < 0.0:
+            variance = 0.0
+        if avg_fcf != 0.0:
+            cv = np.sqrt(variance) / avg_fcf * 100.0
+    return avg_fcf, cv, negative_years, cfo.mean(), capex.mean()
+
+
+# Warm the JIT cache at import so the first real call doesn't pay compile cost
+_accrual_score_kernel(np.ones(1), np.ones(1))
+_cash_score_kernel(1.0, 1.0, 1.0)
+_accrual_stats_kernel(np.ones(1), np.ones(1))
+_dep_volatility_kernel(np.ones(2), np.ones(2))
+_fcf_stats_kernel(np.ones(2), np.ones(2))
+
 
 class FinancialAnalyzer:
     """Analyzes financial metrics and quality of earnings"""
-    
+
     @staticmethod
-    def cumulative_pat_vs_cfo(pat_list: List[float], cfo_list: List[float], rolling_window: int = 3) -> Dict[str, any]:
+    def aggregates(pat_list: List[float], cfo_list: List[float], ebitda_list: List[float]) -> _Aggregates:
+        """
+        Compute the PAT/CFO/EBITDA reductions shared by several metrics
+
+        Callers running the full metric suite should compute this once and
+        pass it to cumulative_pat_vs_cfo, cfo_ebitda_consistency and
+        accrual_quality via their agg parameter.
+
+        Args:
+            pat_list: List of PAT values
+            cfo_list: List of CFO values
+            ebitda_list: List of EBITDA values
+
+        Returns:
+            _Aggregates namedtuple with sums, means and years of data
+        """
+        pat = np.asarray(pat_list, dtype=np.float64)
+        cfo = np.asarray(cfo_list, dtype=np.float64)
+        ebitda = np.asarray(ebitda_list, dtype=np.float64)
+
+        # fsum: compensated summation, so long horizons don't accumulate
+        # float drift that would perturb ratios (and cache keys built on them)
+        sum_pat = math.fsum(pat)
+        sum_cfo = math.fsum(cfo)
+        return _Aggregates(
+            sum_pat=sum_pat,
+            sum_cfo=sum_cfo,
+            avg_pat=sum_pat / pat.size if pat.size else 0.0,
+            avg_cfo=sum_cfo / cfo.size if cfo.size else 0.0,
+            avg_ebitda=float(ebitda.mean()) if ebitda.size else 0.0,
+            years=min(pat.size, cfo.size)
+        )
+
+    @staticmethod
+    def cumulative_pat_vs_cfo(pat_list: List[float], cfo_list: List[float], rolling_window: int = 3, agg: _Aggregates = None) -> Dict[str, any]:
         """
         Compare cumulative PAT vs CFO - returns ratio for available period
-        
+
         Args:
             pat_list: List of PAT values (oldest to newest)
             cfo_list: List of CFO values (oldest to newest)
             rolling_window: Window size for rolling average (default 3 years)
-            
+            agg: Optional precomputed aggregates (skips the internal sums)
+
         Returns:
             Dict with ratio value and actual years of data used
         """
         if len(pat_list) < 1 or len(cfo_list) < 1:
             return {"value": 0.0, "years": 0, "warning": "Insufficient data"}
-        
-        years_available = min(len(pat_list), len(cfo_list))
-        cumulative_pat = sum(pat_list)
-        cumulative_cfo = sum(cfo_list)
+
+        if agg is not None:
+            years_available = agg.years
+            cumulative_pat = agg.sum_pat
+            cumulative_cfo = agg.sum_cfo
+        else:
+            pat = np.asarray(pat_list, dtype=np.float64)
+            cfo = np.asarray(cfo_list, dtype=np.float64)
+            years_available = min(pat.size, cfo.size)
+            cumulative_pat = math.fsum(pat)
+            cumulative_cfo = math.fsum(cfo)
         ratio = cumulative_cfo / cumulative_pat if cumulative_pat != 0 else 0
-        
+
         return {
-            "value": round(ratio, 3),
+            "value": float(ratio),
             "years": years_available,
             "warning": "Only 3 years available" if years_available < 10 else None
         }
-    
+
     @staticmethod
-    def cfo_ebitda_consistency(cfo_list: List[float], ebitda_list: List[float], threshold: float = 0.7) -> Dict[str, any]:
+    def cfo_ebitda_consistency(cfo_list: List[float], ebitda_list: List[float], threshold: float = 0.7, agg: _Aggregates = None) -> Dict[str, any]:
         """
         Check CFO/EBITDA consistency - returns detailed breakdown
-        
+
         Args:
             cfo_list: List of CFO values
             ebitda_list: List of EBITDA values
             threshold: Minimum acceptable ratio (default 0.7)
-            
+            agg: Optional precomputed aggregates (skips the internal means)
+
         Returns:
             Dict with average CFO, average EBITDA, and ratio
         """
@@ -50,27 +207,32 @@ class FinancialAnalyzer:
                 "avg_ebitda": 0.0,
                 "ratio": 0.0
             }
-        
-        avg_cfo = statistics.mean(cfo_list)
-        avg_ebitda = statistics.mean(ebitda_list)
+
+        if agg is not None:
+            avg_cfo = agg.avg_cfo
+            avg_ebitda = agg.avg_ebitda
+        else:
+            avg_cfo = np.asarray(cfo_list, dtype=np.float64).mean()
+            avg_ebitda = np.asarray(ebitda_list, dtype=np.float64).mean()
         ratio = avg_cfo / avg_ebitda if avg_ebitda != 0 else 0
-        
+
         return {
-            "avg_cfo": round(avg_cfo, 2),
-            "avg_ebitda": round(avg_ebitda, 2),
-            "ratio": round(ratio, 3)
+            "avg_cfo": float(avg_cfo),
+            "avg_ebitda": float(avg_ebitda),
+            "ratio": float(ratio)
         }
-    
+
     @staticmethod
-    def accrual_quality(pat_list: List[float], cfo_list: List[float]) -> Dict[str, any]:
+    def accrual_quality(pat_list: List[float], cfo_list: List[float], agg: _Aggregates = None) -> Dict[str, any]:
         """
         Measure accrual profit conversion quality
         Returns detailed accrual analysis
-        
+
         Args:
             pat_list: List of PAT values
             cfo_list: List of CFO values
-            
+            agg: Optional precomputed aggregates (skips the internal means)
+
         Returns:
             Dict with average PAT, CFO, accruals, and accrual ratio
         """
@@ -79,102 +241,113 @@ class FinancialAnalyzer:
                 "avg_pat": 0.0,
                 "avg_cfo": 0.0,
                 "avg_accruals": 0.0,
-                "accrual_ratio": 0.0
+                "accrual_ratio": 0.0,
+                "score": 1
             }
-        
-        avg_pat = statistics.mean(pat_list)
-        avg_cfo = statistics.mean(cfo_list)
-        accruals = [pat - cfo for pat, cfo in zip(pat_list, cfo_list)]
-        avg_accruals = statistics.mean(accruals)
-        accrual_ratio = statistics.mean([abs(acc) / avg_pat for acc in accruals if avg_pat != 0])
-        
+
+        pat = np.asarray(pat_list, dtype=np.float64)
+        cfo = np.asarray(cfo_list, dtype=np.float64)
+
+        # The kernel indexes both arrays over one range with bounds checks
+        # compiled out; truncate mismatched inputs to the common length
+        n = min(pat.size, cfo.size)
+        pat = pat[:n]
+        cfo = cfo[:n]
+
+        avg_pat, avg_cfo, avg_accruals, accrual_ratio = _accrual_stats_kernel(pat, cfo)
+        if agg is not None:
+            avg_pat = agg.avg_pat
+            avg_cfo = agg.avg_cfo
+
         return {
-            "avg_pat": round(avg_pat, 2),
-            "avg_cfo": round(avg_cfo, 2),
-            "avg_accruals": round(avg_accruals, 2),
-            "accrual_ratio": round(accrual_ratio, 4)
+            "avg_pat": float(avg_pat),
+            "avg_cfo": float(avg_cfo),
+            "avg_accruals": float(avg_accruals),
+            "accrual_ratio": float(accrual_ratio),
+            "score": _accrual_score_kernel(pat, cfo)
         }
-    
+
     @staticmethod
     def depreciation_volatility(depreciation_list: List[float], sales_list: List[float]) -> float:
         """
         Analyze volatility in depreciation as percentage of sales
         Returns percentage volatility
-        
+
         Args:
             depreciation_list: List of depreciation values
             sales_list: List of sales values
-            
+
         Returns:
             Volatility as percentage
         """
         if len(depreciation_list) < 2 or len(sales_list) < 2:
             return 0.0
-        
-        depreciation_ratios = [
-            (dep / sales * 100) if sales != 0 else 0 
-            for dep, sales in zip(depreciation_list, sales_list)
-        ]
-        
-        avg_ratio = statistics.mean(depreciation_ratios)
-        volatility = statistics.stdev(depreciation_ratios) if len(depreciation_ratios) > 1 else 0
-        cv = (volatility / avg_ratio * 100) if avg_ratio != 0 else 0  # Coefficient of variation
-        
-        return round(cv, 2)
-    
+
+        dep = np.asarray(depreciation_list, dtype=np.float64)
+        sales = np.asarray(sales_list, dtype=np.float64)
+
+        # Truncate to the common length: the kernel iterates one range over
+        # both arrays without bounds checks (n >= 2 after the guard above)
+        n = min(dep.size, sales.size)
+
+        # Single compiled pass: ratios, sum and sum-of-squares fused
+        return float(_dep_volatility_kernel(dep[:n], sales[:n]))
+
     @staticmethod
     def cash_earning_rate(cash_balance: float, risk_free_rate: float, annual_earnings: float = None) -> Dict[str, any]:
         """
         Check if company is earning above risk-free rate on cash
         Returns detailed cash earnings information
-        
+
         Args:
             cash_balance: Current cash balance
             risk_free_rate: Risk-free rate (as percentage)
             annual_earnings: Annual earnings on cash (optional - interest income)
-            
+
         Returns:
             Dict with cash balance, risk-free rate, expected earnings, actual earnings, and earning rate
         """
         expected_annual_earnings = (cash_balance * risk_free_rate) / 100
-        
+
         # If annual_earnings not provided, cannot calculate properly
         if annual_earnings is None:
             return {
-                "cash_balance": round(cash_balance, 2),
+                "cash_balance": float(cash_balance),
                 "risk_free_rate": risk_free_rate,
-                "expected_earnings": round(expected_annual_earnings, 2),
+                "expected_earnings": float(expected_annual_earnings),
                 "actual_earnings": None,
                 "earning_rate": None,
+                "score": None,
                 "warning": "No interest income data provided"
             }
-        
+
         # Calculate actual earning rate
         actual_earning_rate = (annual_earnings / cash_balance * 100) if cash_balance != 0 else 0
-        
+
         return {
-            "cash_balance": round(cash_balance, 2),
+            "cash_balance": float(cash_balance),
             "risk_free_rate": risk_free_rate,
-            "expected_earnings": round(expected_annual_earnings, 2),
-            "actual_earnings": round(annual_earnings, 2),
-            "earning_rate": round(actual_earning_rate, 3),
+            "expected_earnings": float(expected_annual_earnings),
+            "actual_earnings": float(annual_earnings),
+            "earning_rate": float(actual_earning_rate),
+            "score": _cash_score_kernel(float(cash_balance), float(risk_free_rate), float(annual_earnings)),
             "warning": None
         }
-    
+
     @staticmethod
     def fcf_quality(cfo_list: List[float], depreciation_list: List[float], capex_list: List[float]) -> Dict[str, any]:
         """
         Detect FCF generation gaps and lumpy FCF patterns
         Returns detailed FCF analysis
-        
+
         Args:
             cfo_list: List of CFO values
             depreciation_list: List of depreciation values (not used - kept for compatibility)
             capex_list: List of capital expenditure values
-            
+
         Returns:
             Dict with average FCF, volatility, negative years, and analysis
-        
+
         Note: FCF = CFO - Capex (depreciation already in CFO)
         """
         if len(cfo_list) < 2:
@@ -186,23 +359,19 @@ class FinancialAnalyzer:
                 "avg_cfo": 0.0,
                 "avg_capex": 0.0
             }
-        
+
+        cfo = np.asarray(cfo_list, dtype=np.float64)
+        capex = np.asarray(capex_list, dtype=np.float64)
+
         # CORRECTED: FCF = CFO - Capex (depreciation already included in CFO)
-        fcf_list = [cfo - capex for cfo, capex in zip(cfo_list, capex_list)]
-        
-        avg_fcf = statistics.mean(fcf_list)
-        avg_cfo = statistics.mean(cfo_list)
-        avg_capex = statistics.mean(capex_list)
-        fcf_volatility = statistics.stdev(fcf_list) if len(fcf_list) > 1 else 0
-        cv = (fcf_volatility / avg_fcf * 100) if avg_fcf != 0 else 0
-        
-        negative_years = sum(1 for fcf in fcf_list if fcf < 0)
-        
+        # One compiled pass: sum, sum-of-squares and negative count fused
+        avg_fcf, cv, negative_years, avg_cfo, avg_capex = _fcf_stats_kernel(cfo, capex)
+
         return {
-            "avg_fcf": round(avg_fcf, 2),
-            "volatility_cv": round(cv, 2),
-            "negative_years": negative_years,
-            "total_years": len(fcf_list),
-            "avg_cfo": round(avg_cfo, 2),
-            "avg_capex": round(avg_capex, 2)
+            "avg_fcf": float(avg_fcf),
+            "volatility_cv": float(cv),
+            "negative_years": int(negative_years),
+            "total_years": int(min(cfo.size, capex.size)),
+            "avg_cfo": float(avg_cfo),
+            "avg_capex": float(avg_capex)
         }
@@ -0,0 +1,138 @@
+"""
+Batch (ticker-universe) version of the FinancialAnalyzer metrics
+
+Operates on 2-D NumPy matrices of shape (n_companies, n_years) in
+structure-of-arrays layout, so every metric is computed for all companies
+with a single row-axis reduction instead of N per-company Python calls.
+"""
+
+from typing import Dict
+import numpy as np
+
+from financial_analyzer import _ACCRUAL_EDGES, _ACCRUAL_SCORES
+
+
+class _Scratch:
+    """
+    Pre-allocated float64 work buffers for analyze_batch
+
+    Loop drivers that call analyze_batch repeatedly can allocate one
+    _Scratch sized to their largest batch and pass it in, keeping the
+    intermediate accrual/FCF/depreciation matrices allocation-free.
+    Not thread-safe: use one instance per worker thread.
+    """
+
+    def __init__(self, n_companies: int, n_years: int):
+        self.accruals = np.empty((n_companies, n_years))
+        self.fcf = np.empty((n_companies, n_years))
+        self.dep_ratios = np.empty((n_companies, n_years))
+
+    def fits(self, n_companies: int, n_years: int) -> bool:
+        """Check whether the buffers can hold a batch of the given shape"""
+        return (self.accruals.shape[0] >= n_companies
+                and self.accruals.shape[1] >= n_years)
+
+
+def analyze_batch(
+    pat_mat: np.ndarray,
+    cfo_mat: np.ndarray,
+    ebitda_mat: np.ndarray,
+    dep_mat: np.ndarray,
+    sales_mat: np.ndarray,
+    capex_mat: np.ndarray,
+    scratch: _Scratch = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute all profit-quality metrics for a universe of companies at once
+
+    Args:
+        pat_mat: PAT values, shape (n_companies, n_years), oldest to newest
+        cfo_mat: CFO values, same shape
+        ebitda_mat: EBITDA values, same shape
+        dep_mat: Depreciation values, same shape
+        sales_mat: Sales/Revenue values, same shape
+        capex_mat: Capital expenditure values, same shape
+        scratch: Optional _Scratch with pre-allocated intermediate buffers
+
+    Returns:
+        Dict of length-n_companies arrays, one entry per metric
+    """
+    pat_mat = np.asarray(pat_mat, dtype=np.float64)
+    cfo_mat = np.asarray(cfo_mat, dtype=np.float64)
+    ebitda_mat = np.asarray(ebitda_mat, dtype=np.float64)
+    dep_mat = np.asarray(dep_mat, dtype=np.float64)
+    sales_mat = np.asarray(sales_mat, dtype=np.float64)
+    capex_mat = np.asarray(capex_mat, dtype=np.float64)
+
+    n_companies, n_years = pat_mat.shape
+    if scratch is not None and scratch.fits(n_companies, n_years):
+        accruals_out = scratch.accruals[:n_companies, :n_years]
+        fcf_out = scratch.fcf[:n_companies, :n_years]
+        dep_ratios_out = scratch.dep_ratios[:n_companies, :n_years]
+    else:
+        accruals_out = fcf_out = dep_ratios_out = None
+
+    # 1. Cumulative PAT vs CFO (dtype pinned so the accumulator never narrows)
+    cum_pat = np.add.reduce(pat_mat, axis=1, dtype=np.float64)
+    cum_cfo = np.add.reduce(cfo_mat, axis=1, dtype=np.float64)
+    cum_ratio = np.divide(cum_cfo, cum_pat, out=np.zeros_like(cum_pat), where=cum_pat != 0)
+
+    # 2. CFO/EBITDA consistency
+    avg_cfo = cfo_mat.mean(axis=1)
+    avg_ebitda = ebitda_mat.mean(axis=1)
+    cfo_ebitda_ratio = np.divide(avg_cfo, avg_ebitda, out=np.zeros_like(avg_cfo), where=avg_ebitda != 0)
+
+    # 3. Accrual quality
+    avg_pat = pat_mat.mean(axis=1)
+    accruals = np.subtract(pat_mat, cfo_mat, out=accruals_out)
+    avg_accruals = accruals.mean(axis=1)
+    abs_accruals = np.abs(accruals).mean(axis=1)
+    accrual_ratio = np.divide(abs_accruals, avg_pat, out=np.zeros_like(avg_pat), where=avg_pat != 0)
+    accrual_score = _ACCRUAL_SCORES[np.searchsorted(_ACCRUAL_EDGES, accrual_ratio)]
+    # The zeroed ratio for avg_pat == 0 rows would look like a perfect 10;
+    # the scalar kernel scores those 1 (quality can't be assessed)
+    accrual_score = np.where(avg_pat != 0, accrual_score, 1)
+
+    # 4. Depreciation volatility (CV of depreciation as % of sales)
+    dep_ratios = np.divide(dep_mat, np.where(sales_mat == 0, 1, sales_mat), out=dep_ratios_out)
+    dep_ratios = np.multiply(dep_ratios, 100, out=dep_ratios)
+    # Zero-sales years contribute 0 to the CV, matching the scalar kernel
+    # (the placeholder divisor above only avoids the divide warning)
+    dep_ratios = np.multiply(dep_ratios, sales_mat != 0, out=dep_ratios)
+    dep_ratio_mean = dep_ratios.mean(axis=1)
+    # ddof=1 needs at least two years; single-year universes get 0 CV like
+    # the scalar kernels instead of nan
+    dep_ratio_std = (dep_ratios.std(ddof=1, axis=1) if n_years > 1
+                     else np.zeros_like(dep_ratio_mean))
+    dep_volatility = np.divide(
+        dep_ratio_std * 100, dep_ratio_mean,
+        out=np.zeros_like(dep_ratio_mean), where=dep_ratio_mean != 0
+    )
+
+    # 6. FCF quality (FCF = CFO - Capex; depreciation already in CFO)
+    fcf = np.subtract(cfo_mat, capex_mat, out=fcf_out)
+    avg_fcf = fcf.mean(axis=1)
+    fcf_std = (fcf.std(ddof=1, axis=1) if n_years > 1
+               else np.zeros_like(avg_fcf))
+    fcf_volatility = np.divide(
+        fcf_std * 100, avg_fcf,
+        out=np.zeros_like(avg_fcf), where=avg_fcf != 0
+    )
+    negative_years = (fcf < 0).sum(axis=1)
+
+    return {
+        "cum_pat": cum_pat,
+        "cum_cfo": cum_cfo,
+        "cum_ratio": cum_ratio,
+        "avg_cfo": avg_cfo,
+        "avg_ebitda": avg_ebitda,
+        "cfo_ebitda_ratio": cfo_ebitda_ratio,
+        "avg_pat": avg_pat,
+        "avg_accruals": avg_accruals,
+        "accrual_ratio": accrual_ratio,
+        "accrual_score": accrual_score,
+        "dep_volatility": dep_volatility,
+        "avg_fcf": avg_fcf,
+        "fcf_volatility": fcf_volatility,
+        "negative_fcf_years": negative_years,
+    }
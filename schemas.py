@@ -1,8 +1,13 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
+import numpy as np
 
 class FinancialData(BaseModel):
     """Input schema for financial data"""
+    # Frozen: validation happens once at the trust boundary; downstream code
+    # works on the float64 arrays from to_arrays() instead of re-validating
+    model_config = {"frozen": True}
+
     pat: List[float]  # Profit After Tax (list of values)
     cfo: List[float]  # Cash Flow from Operations (list of values)
     ebitda: List[float]  # EBITDA (list of values)
@@ -11,7 +16,18 @@ class FinancialData(BaseModel):
     capex: List[float] = []  # Capital Expenditure (optional, defaults to empty)
     cash_balance: float  # Current cash balance
     risk_free_rate: float  # Risk-free rate (as percentage)
-    
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Convert the validated series to contiguous float64 arrays"""
+        return {
+            "pat": np.asarray(self.pat, dtype=np.float64),
+            "cfo": np.asarray(self.cfo, dtype=np.float64),
+            "ebitda": np.asarray(self.ebitda, dtype=np.float64),
+            "depreciation": np.asarray(self.depreciation, dtype=np.float64),
+            "sales": np.asarray(self.sales, dtype=np.float64),
+            "capex": np.asarray(self.capex, dtype=np.float64),
+        }
+
 class AnalysisConfig(BaseModel):
     """Configuration for analysis parameters"""
     cfo_ebitda_threshold: float = 0.7
@@ -11,13 +11,15 @@ load_dotenv()
 api_key = os.getenv("API_KEY")
 api_base_url = os.getenv("API_BASE_URL")
 
-headers = {"x-api-key": api_key}
+# Keep-alive session so repeated runs/requests reuse the connection
+session = requests.Session()
+session.headers.update({"x-api-key": api_key})
 endpoint = f"{api_base_url}/server/company/TCS.NS"
 
 print(f"Testing: {endpoint}")
 
 try:
-    response = requests.get(endpoint, headers=headers, timeout=30)
+    response = session.get(endpoint, timeout=(3.05, 30))
     response.encoding = 'utf-8'
     
     print(f"Status Code: {response.status_code}")
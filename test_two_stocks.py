@@ -1,21 +1,32 @@
 """
 Test profit quality analysis with two Indian stocks
+
+The analyses are network-bound, so they are dispatched through a thread
+pool and run concurrently; every worker reuses the tool's shared
+keep-alive session, so wall time stays near one round-trip regardless of
+how many tickers are added below.
 """
 
-from tools.profit_quality import profit_quality_analysis
+from concurrent.futures import ThreadPoolExecutor
 
-print("=" * 70)
-print("TEST 1: TCS (Tata Consultancy Services)")
-print("=" * 70)
+from tools.profit_quality import _profit_quality_core
 
-result1 = profit_quality_analysis(company_id="TCS.NS", risk_free_rate=0.045)
-print(result1)
+TICKERS = [
+    ("TCS.NS", "TCS (Tata Consultancy Services)"),
+    ("RELIANCE.NS", "RELIANCE (Reliance Industries)"),
+]
+RISK_FREE_RATE = 0.045
 
-print("\n\n")
+with ThreadPoolExecutor(max_workers=8) as executor:
+    futures = {
+        ticker: executor.submit(_profit_quality_core, ticker, RISK_FREE_RATE)
+        for ticker, _ in TICKERS
+    }
 
-print("=" * 70)
-print("TEST 2: RELIANCE (Reliance Industries)")
-print("=" * 70)
+for i, (ticker, label) in enumerate(TICKERS, start=1):
+    print("=" * 70)
+    print(f"TEST {i}: {label}")
+    print("=" * 70)
 
-result2 = profit_quality_analysis(company_id="RELIANCE.NS", risk_free_rate=0.045)
-print(result2)
+    print(futures[ticker].result())
+    print("\n\n")
@@ -0,0 +1,106 @@
+"""
+Fused Numba kernel for the per-company analysis hot path
+
+All six metric reductions run in a single compiled pass over the float64
+series, so the orchestrator pays one typed call instead of six Python
+method dispatches with dict packing in between. cache=True persists the
+compiled binary, so the JIT cost is paid once per machine, not per run.
+"""
+
+from numba import njit
+import numpy as np
+
+
+@njit(cache=True, fastmath=True)
+def analyze(pat, cfo, ebitda, dep, sales, capex):
+    """
+    Compute every per-company metric in one fused pass
+
+    Args:
+        pat, cfo, ebitda, dep, sales, capex: equal-length float64 arrays
+            (oldest to newest)
+
+    Returns:
+        Tuple of floats:
+        (cum_pat, cum_cfo, cum_ratio,
+         avg_cfo, avg_ebitda, cfo_ebitda_ratio,
+         avg_pat, avg_accruals, accrual_ratio,
+         dep_volatility_cv,
+         avg_fcf, fcf_volatility_cv, negative_fcf_years, avg_capex)
+    """
+    n = pat.shape[0]
+    if n == 0:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    # Explicit loops: Numba compiles these to one vectorized pass per series
+    cum_pat = 0.0
+    cum_cfo = 0.0
+    sum_ebitda = 0.0
+    sum_acc = 0.0
+    sum_abs_acc = 0.0
+    dep_ratio_sum = 0.0
+    dep_ratio_sumsq = 0.0
+    fcf_sum = 0.0
+    fcf_sumsq = 0.0
+    sum_capex = 0.0
+    negative_fcf_years = 0.0
+    for i in range(n):
+        cum_pat += pat[i]
+        cum_cfo += cfo[i]
+        sum_ebitda += ebitda[i]
+
+        acc = pat[i] - cfo[i]
+        sum_acc += acc
+        sum_abs_acc += abs(acc)
+
+        ratio = dep[i] / sales[i] * 100.0 if sales[i] != 0.0 else 0.0
+        dep_ratio_sum += ratio
+        dep_ratio_sumsq += ratio * ratio
+
+        fcf = cfo[i] - capex[i]
+        fcf_sum += fcf
+        fcf_sumsq += fcf * fcf
+        if fcf < 0.0:
+            negative_fcf_years += 1.0
+        sum_capex += capex[i]
+
+    cum_ratio = cum_cfo / cum_pat if cum_pat != 0.0 else 0.0
+
+    avg_pat = cum_pat / n
+    avg_cfo = cum_cfo / n
+    avg_ebitda = sum_ebitda / n
+    avg_capex = sum_capex / n
+    cfo_ebitda_ratio = avg_cfo / avg_ebitda if avg_ebitda != 0.0 else 0.0
+
+    avg_accruals = sum_acc / n
+    accrual_ratio = (sum_abs_acc / n) / avg_pat if avg_pat != 0.0 else 0.0
+
+    # Coefficients of variation from the sum / sum-of-squares accumulators
+    dep_cv = 0.0
+    fcf_cv = 0.0
+    avg_fcf = fcf_sum / n
+    if n > 1:
+        avg_dep_ratio = dep_ratio_sum / n
+        dep_var = (dep_ratio_sumsq - dep_ratio_sum * dep_ratio_sum / n) / (n - 1)
+        if dep_var < 0.0:
+            dep_var = 0.0
+        if avg_dep_ratio != 0.0:
+            dep_cv = np.sqrt(dep_var) / avg_dep_ratio * 100.0
+
+        fcf_var = (fcf_sumsq - fcf_sum * fcf_sum / n) / (n - 1)
+        if fcf_var < 0.0:
+            fcf_var = 0.0
+        if avg_fcf != 0.0:
+            fcf_cv = np.sqrt(fcf_var) / avg_fcf * 100.0
+
+    return (cum_pat, cum_cfo, cum_ratio,
+            avg_cfo, avg_ebitda, cfo_ebitda_ratio,
+            avg_pat, avg_accruals, accrual_ratio,
+            dep_cv,
+            avg_fcf, fcf_cv, negative_fcf_years, avg_capex)
+
+
+# Warm the JIT/disk cache at import with a tiny dummy call
+_z = np.zeros(1)
+analyze(_z, _z, _z, _z, _z, _z)
+del _z
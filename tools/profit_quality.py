@@ -6,25 +6,149 @@ Fetches financial data from API and performs comprehensive profit quality analys
 # IMPORTS: Required libraries including LangChain tool decorator
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
+import functools
+import hashlib
+import json
+import logging
 import os
+import time
+from operator import itemgetter
 import requests
+
+try:
+    import orjson  # C/SIMD JSON parser, ~2-5x faster than stdlib json
+except ImportError:
+    orjson = None
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+from joblib import Memory
 from typing import Dict, List
 from dotenv import load_dotenv
 import sys
 
-# Set UTF-8 encoding for Windows console
-if sys.platform == 'win32':
-    sys.stdout.reconfigure(encoding='utf-8')
+_log = logging.getLogger(__name__)
+
+try:
+    # Normal case: the project root is already on sys.path (imported as
+    # tools.profit_quality by main.py / the agent)
+    from financial_analyzer import FinancialAnalyzer
+    from financial_analyzer_batch import analyze_batch
+except ImportError:
+    # Direct-script execution only: put the project root on sys.path;
+    # the abspath syscalls stay off the normal import path
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from financial_analyzer import FinancialAnalyzer
+    from financial_analyzer_batch import analyze_batch
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Prefer the AOT-built extension (see build_kernels.py) — no JIT warmup;
+# fall back to the cached-JIT kernel when the build step hasn't been run
+try:
+    from pq_kernels import analyze as analyze_kernel
+except ImportError:
+    from tools._kernels import analyze as analyze_kernel
 
-from financial_analyzer import FinancialAnalyzer
+# Skip the .env file parse when the key is already in the environment
+# (the common case on deployed workers)
+if "AC_API_KEY" not in os.environ:
+    load_dotenv()
 
-load_dotenv()
+# Analyzer methods are all static/pure, so one shared instance serves
+# every invocation
+_ANALYZER = FinancialAnalyzer()
 
-# API Configuration
+# Accepted exchange suffixes (NSE/BSE)
+_VALID_SUFFIXES = frozenset((".NS", ".BO"))
+
+# API Configuration (read once at import; per-call env lookups add up in
+# batch runs)
 BASE_URL = "https://ac-api-server.vercel.app"
 API_KEY = os.getenv("AC_API_KEY")
+_API_BASE_URL = BASE_URL.rstrip('/')
+
+# Shared HTTP session: keep-alive connection pool so repeated company fetches
+# reuse one TCP/TLS connection instead of paying a handshake per request
+_SESSION = requests.Session()
+if API_KEY:
+    _SESSION.headers.update({"x-api-key": API_KEY})
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# Analyzer version: part of the disk-cache key, so cached reports are
+# invalidated automatically whenever the analysis logic changes
+__version__ = "1.0"
+
+# On-disk cache for finished reports; survives process restarts so a fresh
+# CLI/notebook run skips fetch+analyze for previously-seen tickers
+_memory = Memory(".pqcache", verbose=0)
+
+# Raw API responses are also cached on disk: financials change at most
+# quarterly, so repeated runs within a day skip the network round-trip
+_RAW_CACHE_DIR = ".pq_cache"
+_RAW_CACHE_TTL = 86400  # seconds
+
+# Report bodies built once at import; format_map reuses the parsed format
+# specs across calls instead of recompiling a 40-line f-string each time.
+# The cash section has two variants depending on whether interest income
+# is available.
+_CASH_SECTION_WITH_EARNINGS = """5. COMPANY CASH EARNINGS ANALYSIS:
+   Cash Balance: {cash_balance_val:,.2f}
+   Risk-Free Rate: {risk_free_rate_val:.2f}%
+   Expected Earnings at Risk-Free Rate: {expected_earnings:,.2f}
+   Actual Interest Income: {actual_earnings:,.2f}
+   Actual Earning Rate: {earning_rate:.3f}%"""
+
+_CASH_SECTION_NO_EARNINGS = """5. COMPANY CASH EARNINGS ANALYSIS:
+   Cash Balance: {cash_balance_val:,.2f}
+   Risk-Free Rate: {risk_free_rate_val:.2f}%
+   Expected Earnings at Risk-Free Rate: {expected_earnings:,.2f}
+   Actual Interest Income: Data not available"""
+
+_REPORT_TEMPLATE = """
+PROFIT QUALITY & ACCRUAL ANALYSIS REPORT
+Company: {company_id}
+Risk-Free Rate: {risk_free_rate_pct:.2f}%
+Data Period: {years_used} years
+========================================
+
+{warning_section}
+1. CUMULATIVE PAT vs CFO RATIO ({years_used}Y):
+   Cumulative PAT: {cumulative_pat:,.2f}
+   Cumulative CFO: {cumulative_cfo:,.2f}
+   Ratio (CFO/PAT): {pat_vs_cfo:.3f}
+
+2. CFO/EBITDA CONSISTENCY:
+   Average CFO: {avg_cfo:,.2f}
+   Average EBITDA: {avg_ebitda:,.2f}
+   CFO/EBITDA Ratio: {cfo_ebitda_ratio:.3f}
+
+3. ACCRUAL PROFIT CONVERSION QUALITY:
+   Average PAT: {avg_pat:,.2f}
+   Average CFO: {avg_cfo_accrual:,.2f}
+   Average Accruals (PAT - CFO): {avg_accruals:,.2f}
+   Accrual Ratio (Accruals/PAT): {accrual_ratio:.4f}
+   (Lower ratio = Better quality)
+
+4. DEPRECIATION VOLATILITY (as % of sales):
+   Volatility: {dep_volatility:.2f}%
+
+{cash_section}
+
+6. FREE CASH FLOW ANALYSIS:
+   Average CFO: {avg_cfo_fcf:,.2f}
+   Average Capex: {avg_capex:,.2f}
+   Average FCF (CFO - Capex): {avg_fcf:,.2f}
+   FCF Volatility (CV%): {fcf_volatility:.2f}%
+   Negative FCF Years: {negative_years} out of {total_years}
+
+========================================
+Analysis Complete
+"""
 
 # INPUT SCHEMA: Configuration object that LangChain reads
 class ProfitQualityInput(BaseModel):
@@ -40,6 +164,17 @@ class ProfitQualityInput(BaseModel):
         le=1.0
     )
 
+class _UncacheableReport(Exception):
+    """
+    Raised by _fetch_and_analyze for outputs that must not be persisted:
+    error strings and mock-data fallbacks. Carries the report text so the
+    entry points can still return it to the caller.
+    """
+    def __init__(self, report: str):
+        super().__init__(report)
+        self.report = report
+
+
 # TOOL DEFINITION: LangChain tool with name, description, and schema
 @tool("profit_quality_analysis", args_schema=ProfitQualityInput, return_direct=True)
 def profit_quality_analysis(company_id: str, risk_free_rate: float) -> str:
@@ -63,219 +198,482 @@ def profit_quality_analysis(company_id: str, risk_free_rate: float) -> str:
     Returns:
         Formatted string with comprehensive analysis results including all metrics, ratios, and quality scores
     """
-    # Validate symbol format
-    if not (company_id.endswith(".NS") or company_id.endswith(".BO")):
-        return f"Error: Invalid symbol format '{company_id}'. Please use format: SYMBOL.NS (NSE) or SYMBOL.BO (BSE)"
+    # Thin wrapper: the real work happens in _run_analysis, so direct
+    # callers skip LangChain's arg serialization and callback dispatch.
+    # The pipeline is deterministic in (company_id, risk_free_rate), so repeat
+    # queries hit the memo instead of re-fetching and re-analyzing. The hour
+    # bucket in the key expires entries as fresh data may appear.
+    return _analyze_ticker(company_id, risk_free_rate)
+
+
+def _analyze_ticker(company_id: str, risk_free_rate: float) -> str:
+    """
+    Shared memoized entry for ticker analyses (tool wrapper and agent)
+
+    Error and mock-fallback reports surface as _UncacheableReport from the
+    cache layers below; they are returned to the caller but never stored,
+    so a transient outage or bad key doesn't pin a stale result.
+    """
+    try:
+        return _analyze(company_id, round(risk_free_rate, 4), int(time.time() // 3600))
+    except _UncacheableReport as exc:
+        return exc.report
+
+
+@functools.lru_cache(maxsize=1024)
+def _analyze(company_id: str, risk_free_rate: float, _hour_bucket: int) -> str:
+    """Memoized ticker path (keyed by company, rate, hour bucket)"""
+    return _fetch_and_analyze(company_id, risk_free_rate, __version__, _hour_bucket // 24)
+
+
+@_memory.cache
+def _fetch_and_analyze(company_id: str, risk_free_rate: float, _code_version: str, _date_bucket: int) -> str:
+    """
+    Disk-cached ticker analysis
+
+    _code_version keys out entries from older analysis logic; _date_bucket
+    gives the disk layer a daily refresh so data can actually move. Error
+    and mock outputs are raised as _UncacheableReport instead of returned,
+    which keeps them out of both this cache and the lru above (neither
+    stores exceptions).
+    """
+    try:
+        report, used_mock = _run_analysis(company_id, risk_free_rate)
+    except Exception as e:
+        raise _UncacheableReport(_error_text(e)) from e
+    if used_mock:
+        raise _UncacheableReport(report)
+    return report
+
+
+def _error_text(exc: Exception) -> str:
+    """Render an analysis failure the way the report entry points return it"""
+    if isinstance(exc, ValueError):
+        return str(exc)
+    return (f"Error during analysis: {str(exc)}\n\nPlease check:\n"
+            "- API credentials in .env\n- Company ID is valid\n- API endpoint is accessible")
+
+
+def _profit_quality_core(company_id: str, risk_free_rate: float, financial_data=None) -> str:
+    """
+    Direct-dispatch core of the profit quality analysis
+
+    In-process callers (agent.py, the LangGraph nodes) can call this
+    instead of the LangChain tool wrapper to avoid per-call Pydantic arg
+    validation and callback overhead. No caching: use _analyze_ticker for
+    the memoized ticker path.
+
+    Args:
+        company_id: Company ticker symbol (display label when financial_data given)
+        risk_free_rate: Risk-free rate as decimal (e.g., 0.07 for 7%)
+        financial_data: Optional schemas.FinancialData analyzed in place of
+            data fetched from the API
+
+    Returns:
+        Formatted string with the full analysis report
+    """
+    try:
+        report, _ = _run_analysis(company_id, risk_free_rate, financial_data)
+        return report
+    except Exception as e:
+        return _error_text(e)
+
+
+def _run_analysis(company_id: str, risk_free_rate: float, financial_data=None) -> tuple:
+    """
+    Build the full analysis report
+
+    Returns:
+        (report, used_mock) tuple; used_mock is True when the numbers came
+        from the mock-data fallback rather than the API
+
+    Raises:
+        ValueError: On validation, auth or lookup failures
+    """
+    # Validate symbol format (only meaningful when we have to fetch)
+    if financial_data is None and company_id[-3:] not in _VALID_SUFFIXES:
+        raise ValueError(f"Error: Invalid symbol format '{company_id}'. Please use format: SYMBOL.NS (NSE) or SYMBOL.BO (BSE)")
+
+    if financial_data is not None:
+        # Validated once at the model boundary; to_arrays() hands the six
+        # series over as float64 arrays, same shape as the fetch path
+        data = financial_data.to_arrays()
+        data["cash_balance"] = financial_data.cash_balance
+        data["interest_income"] = None
+    else:
+        # Fetch data from API (falls back to mock data if unreachable)
+        data = _fetch_company_data(company_id)
+
+    used_mock = bool(data.get("is_mock"))
+
+    # Extract financial metrics
+    pat_list = data.get("pat", [])
+    cfo_list = data.get("cfo", [])
+    ebitda_list = data.get("ebitda", [])
+    depreciation_list = data.get("depreciation", [])
+    sales_list = data.get("sales", [])
+    capex_list = data.get("capex", [])
+    cash_balance = data.get("cash_balance", 0)
+    interest_income = data.get("interest_income", None)
+    
+    # API ingestion guarantees equal-length series; only the custom
+    # FinancialData path (capex optional) can still hit this branch
+    if len(capex_list) < len(cfo_list):
+        capex_list = np.zeros(len(cfo_list))
     
+    # Convert risk_free_rate from decimal to percentage
+    risk_free_rate_pct = risk_free_rate * 100
+
+    # Run analysis (EXECUTION BLOCK: one fused JIT kernel call computes
+    # every series reduction in a single compiled pass)
+    pat_arr = np.asarray(pat_list, dtype=np.float64)
+    cfo_arr = np.asarray(cfo_list, dtype=np.float64)
+    ebitda_arr = np.asarray(ebitda_list, dtype=np.float64)
+    dep_arr = np.asarray(depreciation_list, dtype=np.float64)
+    sales_arr = np.asarray(sales_list, dtype=np.float64)
+    capex_arr = np.asarray(capex_list, dtype=np.float64)
+
+    # The kernel indexes all six arrays over one shared range, with bounds
+    # checks compiled out; the custom FinancialData path doesn't enforce
+    # equal series lengths, so truncate to the common horizon first
+    # (slices are views, free for the already-equal API path)
+    n_years = min(pat_arr.size, cfo_arr.size, ebitda_arr.size,
+                  dep_arr.size, sales_arr.size, capex_arr.size)
+    pat_arr = pat_arr[:n_years]
+    cfo_arr = cfo_arr[:n_years]
+    ebitda_arr = ebitda_arr[:n_years]
+    dep_arr = dep_arr[:n_years]
+    sales_arr = sales_arr[:n_years]
+    capex_arr = capex_arr[:n_years]
+
+    (cumulative_pat, cumulative_cfo, pat_vs_cfo,
+     avg_cfo, avg_ebitda, cfo_ebitda_ratio,
+     avg_pat, avg_accruals, accrual_ratio,
+     dep_volatility,
+     avg_fcf, fcf_volatility, negative_years_f, avg_capex) = analyze_kernel(
+        pat_arr, cfo_arr, ebitda_arr, dep_arr, sales_arr, capex_arr)
+
+    years_used = int(n_years)
+    total_years = years_used
+    negative_years = int(negative_years_f)
+    avg_cfo_accrual = avg_cfo
+    avg_cfo_fcf = avg_cfo
+
+    if years_used < 1:
+        data_warning = "Insufficient data"
+    elif years_used < 10:
+        data_warning = "Only 3 years available"
+    else:
+        data_warning = None
+
+    # Cash earnings stay on the scalar analyzer path (needs the warning
+    # text and the 1-10 score)
+    cash_score_result = _ANALYZER.cash_earning_rate(cash_balance, risk_free_rate_pct, interest_income)
+
+    # Extract cash earning details
+    cash_balance_val = cash_score_result.get("cash_balance")
+    risk_free_rate_val = cash_score_result.get("risk_free_rate")
+    expected_earnings = cash_score_result.get("expected_earnings")
+    actual_earnings = cash_score_result.get("actual_earnings")
+    earning_rate = cash_score_result.get("earning_rate")
+    cash_warning = cash_score_result.get("warning")
+    
+    # OUTPUT: Single string containing all analysis results (can be as long as needed)
+    warnings = []
+    if data_warning:
+        warnings.append(f"⚠ {data_warning}")
+    if cash_warning:
+        warnings.append(f"⚠ {cash_warning}")
+    
+    warning_section = "\n".join(warnings) + "\n" if warnings else ""
+    
+    # Format point 5 based on whether we have actual earnings data
+    cash_template = (_CASH_SECTION_NO_EARNINGS if actual_earnings is None
+                     else _CASH_SECTION_WITH_EARNINGS)
+    cash_section = cash_template.format_map({
+        "cash_balance_val": cash_balance_val,
+        "risk_free_rate_val": risk_free_rate_val,
+        "expected_earnings": expected_earnings,
+        "actual_earnings": actual_earnings,
+        "earning_rate": earning_rate,
+    })
+    
+    report = _REPORT_TEMPLATE.format_map({
+        "company_id": company_id,
+        "risk_free_rate_pct": risk_free_rate_pct,
+        "years_used": years_used,
+        "warning_section": warning_section,
+        "cumulative_pat": cumulative_pat,
+        "cumulative_cfo": cumulative_cfo,
+        "pat_vs_cfo": pat_vs_cfo,
+        "avg_cfo": avg_cfo,
+        "avg_ebitda": avg_ebitda,
+        "cfo_ebitda_ratio": cfo_ebitda_ratio,
+        "avg_pat": avg_pat,
+        "avg_cfo_accrual": avg_cfo_accrual,
+        "avg_accruals": avg_accruals,
+        "accrual_ratio": accrual_ratio,
+        "dep_volatility": dep_volatility,
+        "cash_section": cash_section,
+        "avg_cfo_fcf": avg_cfo_fcf,
+        "avg_capex": avg_capex,
+        "avg_fcf": avg_fcf,
+        "fcf_volatility": fcf_volatility,
+        "negative_years": negative_years,
+        "total_years": total_years,
+    })
+    return report, used_mock
+
+
+
+def purge_cache() -> None:
+    """Clear all memoized analysis results"""
+    _analyze.cache_clear()
+
+
+def cache_stats():
+    """Return hit/miss statistics for the analysis memo"""
+    return _analyze.cache_info()
+
+
+def purge_disk_cache() -> None:
+    """Clear the on-disk report cache (.pqcache)"""
+    _memory.clear(warn=False)
+
+
+def _raw_cache_path(endpoint: str) -> str:
+    """Return the on-disk cache path for one API endpoint"""
+    digest = hashlib.blake2b(endpoint.encode(), digest_size=16).hexdigest()
+    return os.path.join(_RAW_CACHE_DIR, f"{digest}.json")
+
+
+def _read_raw_cache(path: str) -> bytes:
+    """Return cached response bytes, or None if missing or older than the TTL"""
     try:
-        # Fetch data from API
-        api_key = API_KEY
-        api_base_url = BASE_URL
-        
-        if not api_key or not api_base_url:
-            return "Error: API_KEY and API_BASE_URL must be set in .env file"
-        
-        # Clean up API URL
-        api_base_url = api_base_url.rstrip('/')
-        
-        print(f"Fetching data for {company_id} from {api_base_url}...")
-        
-        # Correct authentication header format for AC API
-        headers = {"x-api-key": api_key}
-        
-        # Fetch complete financial data from AC API
-        endpoint = f"{api_base_url}/server/company/{company_id}"
-        
-        try:
-            response = requests.get(endpoint, headers=headers, timeout=30, allow_redirects=True)
-            response.encoding = 'utf-8'  # Force UTF-8 encoding
-            
-            if response.status_code == 401:
-                return "Error: Invalid or missing API key. Check your API_KEY in .env file"
-            
-            if response.status_code == 404:
-                return f"Error: Company {company_id} not found. Ensure you use the correct format (e.g., TCS.NS or TCS.BO)"
-            
-            if response.status_code != 200:
-                print(f"⚠ API returned status {response.status_code}, using mock data")
-                data = _generate_mock_data(company_id)
-            else:
-                api_response = response.json()
-                
-                if api_response.get("status") != "success":
-                    print(f"⚠ API error: {api_response.get('message')}, using mock data")
-                    data = _generate_mock_data(company_id)
-                else:
-                    print(f"✓ Successfully fetched data from {endpoint}")
-                    financial_data = api_response.get("data", [])
-                    
-                    # Sort by year (oldest to newest) and extract metrics
-                    financial_data.sort(key=lambda x: x.get("calendarYear", 0))
-                    
-                    data = {
-                        "pat": [float(item.get("netIncome", 0)) for item in financial_data],
-                        "cfo": [float(item.get("operatingCashFlow", item.get("netCashProvidedByOperatingActivities", 0))) for item in financial_data],
-                        "ebitda": [float(item.get("ebitda", 0)) for item in financial_data],
-                        "depreciation": [float(item.get("depreciationAndAmortization", 0)) for item in financial_data],
-                        "sales": [float(item.get("revenue", 0)) for item in financial_data],
-                        "capex": [abs(float(item.get("capitalExpenditure", 0))) for item in financial_data],
-                        "cash_balance": float(financial_data[-1].get("cashAndCashEquivalents", 0)) if financial_data else 0,
-                        "interest_income": float(financial_data[-1].get("interestIncome", 0)) if financial_data else None
-                    }
-                    
-        except Exception as e:
-            print(f"⚠ Could not connect to API: {str(e)}, using mock data")
-            data = _generate_mock_data(company_id)
-        
-        # Extract financial metrics
-        pat_list = data.get("pat", [])
-        cfo_list = data.get("cfo", [])
-        ebitda_list = data.get("ebitda", [])
-        depreciation_list = data.get("depreciation", [])
-        sales_list = data.get("sales", [])
-        capex_list = data.get("capex", [])
-        cash_balance = data.get("cash_balance", 0)
-        interest_income = data.get("interest_income", None)
-        
-        # Ensure capex has same length
-        if not capex_list or len(capex_list) < len(cfo_list):
-            capex_list = [0] * len(cfo_list)
-        
-        # Convert risk_free_rate from decimal to percentage
-        risk_free_rate_pct = risk_free_rate * 100
-        
-        # Run analysis (EXECUTION BLOCK: Core calculations and data processing)
-        analyzer = FinancialAnalyzer()
-        
-        pat_vs_cfo_result = analyzer.cumulative_pat_vs_cfo(pat_list, cfo_list)
-        cfo_ebitda = analyzer.cfo_ebitda_consistency(cfo_list, ebitda_list)
-        accrual_result = analyzer.accrual_quality(pat_list, cfo_list)
-        dep_volatility = analyzer.depreciation_volatility(depreciation_list, sales_list)
-        cash_score_result = analyzer.cash_earning_rate(cash_balance, risk_free_rate_pct, interest_income)
-        fcf_result = analyzer.fcf_quality(cfo_list, depreciation_list, capex_list)
-        
-        # Extract values from dicts
-        pat_vs_cfo = pat_vs_cfo_result.get("value")
-        years_used = pat_vs_cfo_result.get("years")
-        data_warning = pat_vs_cfo_result.get("warning")
-        
-        # Extract CFO/EBITDA details
-        avg_cfo = cfo_ebitda.get("avg_cfo")
-        avg_ebitda = cfo_ebitda.get("avg_ebitda")
-        cfo_ebitda_ratio = cfo_ebitda.get("ratio")
-        
-        # Extract accrual quality details
-        avg_pat = accrual_result.get("avg_pat")
-        avg_cfo_accrual = accrual_result.get("avg_cfo")
-        avg_accruals = accrual_result.get("avg_accruals")
-        accrual_ratio = accrual_result.get("accrual_ratio")
-        
-        # Extract cash earning details
-        cash_balance_val = cash_score_result.get("cash_balance")
-        risk_free_rate_val = cash_score_result.get("risk_free_rate")
-        expected_earnings = cash_score_result.get("expected_earnings")
-        actual_earnings = cash_score_result.get("actual_earnings")
-        earning_rate = cash_score_result.get("earning_rate")
-        cash_warning = cash_score_result.get("warning")
-        
-        # Extract FCF quality details
-        avg_fcf = fcf_result.get("avg_fcf")
-        fcf_volatility = fcf_result.get("volatility_cv")
-        negative_years = fcf_result.get("negative_years")
-        total_years = fcf_result.get("total_years")
-        avg_cfo_fcf = fcf_result.get("avg_cfo")
-        avg_capex = fcf_result.get("avg_capex")
-        
-        # Calculate cumulative PAT and CFO for detailed display
-        cumulative_pat = sum(pat_list)
-        cumulative_cfo = sum(cfo_list)
-        
-        # OUTPUT: Single string containing all analysis results (can be as long as needed)
-        warnings = []
-        if data_warning:
-            warnings.append(f"⚠ {data_warning}")
-        if cash_warning:
-            warnings.append(f"⚠ {cash_warning}")
-        
-        warning_section = "\n".join(warnings) + "\n" if warnings else ""
-        
-        # Format point 5 based on whether we have actual earnings data
-        if actual_earnings is None:
-            cash_section = f"""5. COMPANY CASH EARNINGS ANALYSIS:
-   Cash Balance: {cash_balance_val:,.2f}
-   Risk-Free Rate: {risk_free_rate_val:.2f}%
-   Expected Earnings at Risk-Free Rate: {expected_earnings:,.2f}
-   Actual Interest Income: Data not available"""
+        if time.time() - os.path.getmtime(path) < _RAW_CACHE_TTL:
+            with open(path, "rb") as f:
+                return f.read()
+    except OSError:
+        pass
+    return None
+
+
+def _write_raw_cache(path: str, raw: bytes) -> None:
+    """Store response bytes on disk; cache write failures are non-fatal"""
+    try:
+        os.makedirs(_RAW_CACHE_DIR, exist_ok=True)
+        # Write to a per-process temp file and rename into place: readers
+        # (and concurrent writers of the same ticker) never see a
+        # half-written entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _fetch_company_data(company_id: str) -> Dict:
+    """
+    Fetch 10 years of financials for one company from the AC API
+    Falls back to mock data when the API is unreachable or returns an error
+
+    Args:
+        company_id: Company ticker symbol (e.g., RELIANCE.BO)
+
+    Returns:
+        Dict with pat/cfo/ebitda/depreciation/sales/capex lists plus
+        cash_balance and interest_income
+
+    Raises:
+        ValueError: On auth or lookup failures that should abort the analysis
+    """
+    if not API_KEY or not _API_BASE_URL:
+        raise ValueError("Error: API_KEY and API_BASE_URL must be set in .env file")
+
+    _log.info("Fetching data for %s from %s", company_id, _API_BASE_URL)
+
+    # Fetch complete financial data from AC API; auth header is set once on
+    # the shared session at import
+    endpoint = f"{_API_BASE_URL}/server/company/{company_id}"
+
+    try:
+        cache_path = _raw_cache_path(endpoint)
+        raw = _read_raw_cache(cache_path)
+        fetched = raw is None
+
+        if fetched:
+            # stream=True: read the body in 64 KB chunks into one bytearray
+            # so requests skips its internal content buffering/decode pass;
+            # the with block releases the pooled connection on early exits
+            with _SESSION.get(endpoint, timeout=(3.05, 30), allow_redirects=True, stream=True) as response:
+                if response.status_code == 401:
+                    raise ValueError("Error: Invalid or missing API key. Check your API_KEY in .env file")
+
+                if response.status_code == 404:
+                    raise ValueError(f"Error: Company {company_id} not found. Ensure you use the correct format (e.g., TCS.NS or TCS.BO)")
+
+                if response.status_code != 200:
+                    _log.warning("API returned status %s, using mock data", response.status_code)
+                    return _generate_mock_data(company_id)
+
+                buf = bytearray()
+                for chunk in response.iter_content(65536):
+                    buf += chunk
+                raw = bytes(buf)
+            _log.info("Successfully fetched data from %s", endpoint)
         else:
-            cash_section = f"""5. COMPANY CASH EARNINGS ANALYSIS:
-   Cash Balance: {cash_balance_val:,.2f}
-   Risk-Free Rate: {risk_free_rate_val:.2f}%
-   Expected Earnings at Risk-Free Rate: {expected_earnings:,.2f}
-   Actual Interest Income: {actual_earnings:,.2f}
-   Actual Earning Rate: {earning_rate:.3f}%"""
-        
-        output = f"""
-PROFIT QUALITY & ACCRUAL ANALYSIS REPORT
-Company: {company_id}
-Risk-Free Rate: {risk_free_rate_pct:.2f}%
-Data Period: {years_used} years
-========================================
+            _log.info("Using cached response for %s", company_id)
 
-{warning_section}
-1. CUMULATIVE PAT vs CFO RATIO ({years_used}Y):
-   Cumulative PAT: {cumulative_pat:,.2f}
-   Cumulative CFO: {cumulative_cfo:,.2f}
-   Ratio (CFO/PAT): {pat_vs_cfo}
+        # Decode raw bytes directly; orjson skips the encoding dance entirely
+        api_response = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
-2. CFO/EBITDA CONSISTENCY:
-   Average CFO: {avg_cfo:,.2f}
-   Average EBITDA: {avg_ebitda:,.2f}
-   CFO/EBITDA Ratio: {cfo_ebitda_ratio}
+        if api_response.get("status") != "success":
+            _log.warning("API error: %s, using mock data", api_response.get("message"))
+            return _generate_mock_data(company_id)
 
-3. ACCRUAL PROFIT CONVERSION QUALITY:
-   Average PAT: {avg_pat:,.2f}
-   Average CFO: {avg_cfo_accrual:,.2f}
-   Average Accruals (PAT - CFO): {avg_accruals:,.2f}
-   Accrual Ratio (Accruals/PAT): {accrual_ratio}
-   (Lower ratio = Better quality)
+        # Only freshly fetched, successful payloads are cached; rewriting on
+        # a cache hit would reset the mtime the TTL check relies on
+        if fetched:
+            _write_raw_cache(cache_path, raw)
+        financial_data = api_response.get("data", [])
 
-4. DEPRECIATION VOLATILITY (as % of sales):
-   Volatility: {dep_volatility}%
+        # Sort by year (oldest to newest) and extract metrics; itemgetter
+        # dispatches at C speed, so records missing the key are normalized
+        # first rather than handled per-comparison
+        for item in financial_data:
+            item.setdefault("calendarYear", 0)
+        financial_data.sort(key=itemgetter("calendarYear"))
 
-{cash_section}
+        # One explicit pass over the records into a preallocated
+        # (6, n_years) float64 buffer — one row per metric, same layout as
+        # _MOCK_MATRIX — so each series below really is a contiguous row
+        # view. dict.get is bound once outside the loop, and the CFO
+        # fallback key is only consulted when the primary is absent.
+        arr = np.empty((6, len(financial_data)), dtype=np.float64)
+        get = dict.get
+        for i, item in enumerate(financial_data):
+            cfo_val = get(item, "operatingCashFlow")
+            if cfo_val is None:
+                cfo_val = get(item, "netCashProvidedByOperatingActivities", 0)
+            arr[0, i] = get(item, "netIncome", 0)
+            arr[1, i] = cfo_val
+            arr[2, i] = get(item, "ebitda", 0)
+            arr[3, i] = get(item, "depreciationAndAmortization", 0)
+            arr[4, i] = get(item, "revenue", 0)
+            arr[5, i] = get(item, "capitalExpenditure", 0)
+        pat, cfo, ebitda, depreciation, sales, capex = arr
+        # Capex arrives sign-negative from the API; one SIMD pass over the
+        # column beats a Python abs() call per row
+        np.fabs(capex, out=capex)
 
-6. FREE CASH FLOW ANALYSIS:
-   Average CFO: {avg_cfo_fcf:,.2f}
-   Average Capex: {avg_capex:,.2f}
-   Average FCF (CFO - Capex): {avg_fcf:,.2f}
-   FCF Volatility (CV%): {fcf_volatility:.2f}%
-   Negative FCF Years: {negative_years} out of {total_years}
+        return {
+            "pat": pat,
+            "cfo": cfo,
+            "ebitda": ebitda,
+            "depreciation": depreciation,
+            "sales": sales,
+            "capex": capex,
+            "cash_balance": float(financial_data[-1].get("cashAndCashEquivalents", 0)) if financial_data else 0,
+            "interest_income": float(financial_data[-1].get("interestIncome", 0)) if financial_data else None
+        }
 
-========================================
-Analysis Complete
-"""
-        return output
-        
+    except ValueError:
+        raise
     except Exception as e:
-        return f"Error during analysis: {str(e)}\n\nPlease check:\n- API credentials in .env\n- Company ID is valid\n- API endpoint is accessible"
+        _log.warning("Could not connect to API: %s, using mock data", e)
+        return _generate_mock_data(company_id)
+
+
+def profit_quality_analysis_batch(company_ids: List[str], risk_free_rate: float) -> Dict:
+    """
+    Run the profit quality metrics for a universe of companies in one pass
+
+    Fetches financials for every company, stacks them into 2-D
+    (n_companies, n_years) matrices and computes all metrics with a single
+    vectorized call to financial_analyzer_batch.analyze_batch.
+
+    Args:
+        company_ids: List of company ticker symbols
+        risk_free_rate: Risk-free rate as decimal (applies to all companies)
+
+    Returns:
+        Dict with "company_ids" plus one length-n array per metric; tickers
+        whose payload had no yearly records are dropped from both
+    """
+    if not company_ids:
+        return {"company_ids": []}
+
+    keys = ("pat", "cfo", "ebitda", "depreciation", "sales", "capex")
+
+    # Drop tickers whose payload had no yearly records: they can't stack
+    # (a [-0:] slice would pull the full series, not an empty one) and
+    # would otherwise zero out n_years for the whole universe
+    kept_ids = []
+    all_data = []
+    for company_id in company_ids:
+        d = _fetch_company_data(company_id)
+        if min(len(d[k]) for k in keys) > 0:
+            kept_ids.append(company_id)
+            all_data.append(d)
+        else:
+            _log.warning("No yearly records for %s, dropping from batch", company_id)
+
+    if not all_data:
+        return {"company_ids": []}
+
+    # Truncate to the common number of years so rows stack into a matrix
+    n_years = min(min(len(d[k]) for k in keys) for d in all_data)
+
+    matrices = {
+        k: np.array([d[k][-n_years:] for d in all_data], dtype=np.float64)
+        for k in keys
+    }
+
+    results = analyze_batch(
+        matrices["pat"], matrices["cfo"], matrices["ebitda"],
+        matrices["depreciation"], matrices["sales"], matrices["capex"]
+    )
+
+    return {"company_ids": kept_ids, **results}
+
+
+# Mock series built once at import; _generate_mock_data hands out read-only
+# row views instead of allocating ten fresh lists per fallback call
+_MOCK_MATRIX = np.array([
+    [100, 110, 120, 115, 125, 130, 140, 135, 145, 150],    # pat
+    [95, 105, 118, 112, 122, 128, 138, 133, 143, 148],     # cfo
+    [150, 160, 170, 165, 175, 180, 190, 185, 195, 200],    # ebitda
+    [20, 20, 21, 21, 22, 22, 23, 23, 24, 24],              # depreciation
+    [1000, 1050, 1100, 1080, 1150, 1200, 1250, 1220, 1300, 1350],  # sales
+    [30, 32, 35, 33, 38, 40, 42, 41, 45, 48],              # capex
+], dtype=np.float64)
+_MOCK_MATRIX.setflags(write=False)
 
 
 def _generate_mock_data(company_id: str) -> Dict:
     """Generate mock financial data for testing"""
+    pat, cfo, ebitda, depreciation, sales, capex = _MOCK_MATRIX
     return {
         "company_id": company_id,
-        "pat": [100, 110, 120, 115, 125, 130, 140, 135, 145, 150],
-        "cfo": [95, 105, 118, 112, 122, 128, 138, 133, 143, 148],
-        "ebitda": [150, 160, 170, 165, 175, 180, 190, 185, 195, 200],
-        "depreciation": [20, 20, 21, 21, 22, 22, 23, 23, 24, 24],
-        "sales": [1000, 1050, 1100, 1080, 1150, 1200, 1250, 1220, 1300, 1350],
-        "capex": [30, 32, 35, 33, 38, 40, 42, 41, 45, 48],
+        "is_mock": True,
+        "pat": pat,
+        "cfo": cfo,
+        "ebitda": ebitda,
+        "depreciation": depreciation,
+        "sales": sales,
+        "capex": capex,
         "cash_balance": 500
     }
 
 
 # Test the tool
 if __name__ == "__main__":
+    # Set UTF-8 encoding for Windows console (only needed when running the
+    # demo below; server embedders shouldn't pay for or be affected by it)
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+
     # Check if API key is loaded
     if not API_KEY or API_KEY == "your_api_key_here":
         print("❌ ERROR: API key not found!")